@@ -7,6 +7,9 @@ extras = {
         'sphinxcontrib-websupport',
         'typing-extensions',
     ],
+    'speed': [
+        'uvloop; sys_platform != "win32"',
+    ],
 }
 
 setup(
@@ -43,6 +46,6 @@ setup(
             ]
         },
     install_requires=["websockets", "websocket-server", "orjson"],
-    extra_requires=extras,
+    extras_require=extras,
     python_requires=">=3.6",
 )
@@ -7,7 +7,11 @@ from .lib.message import WsMessage
 from .lib.payload import Payloads, MessagePayload, winerpObject, responseObject
 from .lib.errors import *
 import uuid
+import io
+import os
+import socket
 import traceback
+from collections import deque
 from typing import (
     Any,
     Callable,
@@ -15,9 +19,23 @@ from typing import (
     TypeVar,
     Union,
     Dict,
+    Optional,
 )
 
 logger = logging.getLogger(__name__)
+_dumps = orjson.dumps
+_loads = orjson.loads
+_UUID_SENTINEL = "__winerp_uuid__"
+_P_VERIFY = Payloads.verification
+_P_PING = Payloads.ping
+_P_REQ = Payloads.request
+_P_RESP = Payloads.response
+_P_ERR = Payloads.error
+_P_INFO = Payloads.information
+_P_FUNC_CALL = Payloads.function_call
+_P_BATCH = Payloads.batch
+# Return values of these types are sent as they are, anything else is wrapped in a winerpObject
+_JSON_TYPES = (int, float, str, bool, type(None), list, tuple, dict)
 Coro = TypeVar('Coro', bound=Callable[..., Coroutine[Any, Any, Any]])
 
 class Client:
@@ -46,6 +64,7 @@ class Client:
         self.reconnect: bool = reconnect
         self.reconnect_threshold: int = 60
         self.max_data_size: float = 2 #MiB
+        self.send_traceback: bool = True
         self.websocket = None
         self.__routes = {}
         self.__sub_routes = {}
@@ -53,6 +72,23 @@ class Client:
         self.event_listeners: Dict[str, asyncio.Future] = {}
         self._authorized: bool = False
         self._on_hold = False
+        self._uuid_pool: deque = deque()
+        self._send_queue: asyncio.Queue = None
+        self._writer_task: asyncio.Task = None
+        self._pending_batch: list = []
+        self._batch_scheduled: bool = False
+        # Indexed by the integer payload type, see Payloads
+        self._handlers = (
+            self._handle_success,
+            self._handle_unexpected,  # verification, only ever sent by clients
+            self._handle_request,
+            self._handle_response,
+            self._handle_error,
+            self._handle_ping,
+            self._handle_information,
+            self._handle_function_call,
+            self._handle_unexpected,  # batch, unpacked by the server
+        )
         self.events = [
             "on_winerp_connect",
             "on_winerp_ready",
@@ -62,6 +98,14 @@ class Client:
             "on_winerp_information",
             "on_winerp_error"
         ]
+        # The verification frame only varies by its uuid, so it is encoded once here
+        # and completed by concatenation on every (re)connect.
+        verify_frame = _dumps(MessagePayload(
+            type = _P_VERIFY,
+            id = local_name,
+            uuid = _UUID_SENTINEL
+        ).__dict__).decode("utf-8")
+        self.__verify_prefix, _, self.__verify_suffix = verify_frame.rpartition(_UUID_SENTINEL)
     
     @property
     def authorized(self) -> bool:
@@ -77,30 +121,100 @@ class Client:
         '''
         return self._on_hold
 
-    async def send_message(self, data: Union[Any, WsMessage]):
-        if not isinstance(data, WsMessage):
+    async def send_message(self, data: Union[dict, MessagePayload, WsMessage], batchable: bool = False):
+        self._send_nowait(data, batchable)
+
+    def _send_nowait(self, data: Union[dict, MessagePayload, WsMessage], batchable: bool = False):
+        if not isinstance(data, (dict, WsMessage)):
             data = data.__dict__
         logger.debug(data)
-        await self.websocket.send(orjson.dumps(data).decode("utf-8"))
+        # Encoding happens here so serialization errors still reach the caller,
+        # the actual write is left to the writer task.
+        # Frames are kept as str: websockets sends bytes as binary frames, which
+        # the server (websocket_server) drops as unsupported.
+        frame = _dumps(data).decode("utf-8")
+        if not batchable:
+            # The uuid lets the writer fail the matching listener if the frame can't be sent
+            self._send_queue.put_nowait((frame, data.get("uuid") if isinstance(data, dict) else data.uuid))
+            return
+
+        # Batchable messages sent during the same loop iteration go out as one frame
+        self._pending_batch.append(frame)
+        if not self._batch_scheduled:
+            self._batch_scheduled = True
+            asyncio.get_running_loop().call_soon(self.__flush_batch)
+
+    def __flush_batch(self):
+        frames, self._pending_batch = self._pending_batch, []
+        self._batch_scheduled = False
+        if len(frames) == 1:
+            self._send_queue.put_nowait((frames[0], None))
+        else:
+            # The frames are already encoded, so the batch is assembled around them
+            self._send_queue.put_nowait(('{"type":%d,"data":[%s]}' % (_P_BATCH, ",".join(frames)), None))
+
+    def __start_writer(self):
+        if self._writer_task is None or self._writer_task.done():
+            if self._send_queue is None:
+                self._send_queue = asyncio.Queue()
+            self._writer_task = asyncio.create_task(self.__writer())
+
+    async def __writer(self):
+        queue = self._send_queue
+        while True:
+            frames = [await queue.get()]
+            # Drain everything queued in the meantime so a burst goes out back-to-back
+            while not queue.empty():
+                frames.append(queue.get_nowait())
+            sent = 0
+            try:
+                for frame, _ in frames:
+                    await self.websocket.send(frame)
+                    sent += 1
+            except Exception as error:
+                dropped = frames[sent:]
+                logger.warning("Failed to send %d message(s): %r" % (len(dropped), error))
+                # Fail pending requests right away instead of leaving them to time out
+                for _, _uuid in dropped:
+                    future = self.listeners.pop(_uuid, None) if _uuid is not None else None
+                    if future is not None and not future.done():
+                        future.set_exception(error)
     
-    def __send_message(self, data):
-        asyncio.create_task(self.send_message(data))
+    def _refill_uuids(self, n: int = 64):
+        # A single urandom read covers the whole batch of version 4 uuids
+        raw = os.urandom(16 * n)
+        self._uuid_pool.extend(
+            str(uuid.UUID(bytes=raw[i:i + 16], version=4)) for i in range(0, 16 * n, 16)
+        )
+
+    def _next_uuid(self) -> str:
+        if not self._uuid_pool:
+            self._refill_uuids()
+        return self._uuid_pool.popleft()
+
+    async def _send_fixed(self, prefix: str, _uuid: str, suffix: str):
+        await self.websocket.send(prefix + _uuid + suffix)
     
     async def __verify_client(self):
-        payload = MessagePayload(
-            type = Payloads.verification,
-            id = self.local_name,
-            uuid = str(uuid.uuid4())
-        )
-        await self.send_message(payload)
+        await self._send_fixed(self.__verify_prefix, self._next_uuid(), self.__verify_suffix)
         logger.info("Verification request sent")
 
     async def __connect(self) -> None:
         if self.websocket is None or self.websocket.closed:
             logger.info("Connecting to Websocket")
+            # The server only ever listens on localhost, where permessage-deflate is pure
+            # CPU overhead, so compression is not negotiated.
             self.websocket = await websockets.connect(
-                self.uri, close_timeout=0, ping_interval=None, max_size=int(self.max_data_size*1048576)
+                self.uri, close_timeout=0, ping_interval=None, max_size=int(self.max_data_size*1048576),
+                compression=None, read_limit=2**20, write_limit=2**20
             )
+            # Disable Nagle so small request/response frames aren't held back waiting for an ACK
+            sock = self.websocket.transport.get_extra_info("socket")
+            if sock is not None:
+                try:
+                    sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+                except OSError:
+                    logger.debug("Failed to set TCP_NODELAY on the websocket")
             self._authorized = False
             self._dispatch_event('winerp_connect')
             logger.info("Connected to Websocket")
@@ -110,6 +224,7 @@ class Client:
             try:
                 await self.__connect()
                 await self.__verify_client()
+                self.__start_writer()
                 return True
             except:
                 logger.debug(f"Failed to reconnect. Retrying in {self.reconnect_threshold}s")
@@ -132,6 +247,7 @@ class Client:
         if self.websocket is None or self.websocket.closed:
             await self.__connect()
             await self.__verify_client()
+            self.__start_writer()
             asyncio.create_task(self.__on_message())
         else:
             raise ConnectionError("Websocket is already connected!")
@@ -196,15 +312,15 @@ class Client:
             raise UnauthorizedError("Client is not authorized!")
         logger.debug("Pinging IPC Server")
         
-        _uuid = str(uuid.uuid4())
-        payload = MessagePayload(
-            type = Payloads.ping,
-            id = self.local_name,
-            destination = client,
-            uuid = _uuid
-        )
+        _uuid = self._next_uuid()
+        payload = {
+            "type": _P_PING,
+            "id": self.local_name,
+            "destination": client,
+            "uuid": _uuid
+        }
         await self.send_message(payload)
-        resp = await self.__get_response(_uuid, asyncio.get_event_loop(), timeout=timeout)
+        resp = await self.__get_response(_uuid, timeout=timeout)
         return resp.get("success", False)
 
     async def call_function(self, destination, object_identifier, func_name, *args, **kwargs) -> bool:
@@ -214,31 +330,32 @@ class Client:
             raise UnauthorizedError("Client is not authorized!")
         logger.debug("Calling a function IPC Server")
         
-        _uuid = str(uuid.uuid4())
-        payload = MessagePayload(
-            type = Payloads.function_call,
-            id = self.local_name,
-            destination = destination,
-            uuid = _uuid,
-            data={
+        _uuid = self._next_uuid()
+        payload = {
+            "type": _P_FUNC_CALL,
+            "id": self.local_name,
+            "destination": destination,
+            "uuid": _uuid,
+            "data": {
                 "__uuid__": object_identifier,
                 "__func__": func_name,
                 "__args__": list(args),
                 "__kwargs__": dict(kwargs)
             }
-        )
+        }
         await self.send_message(payload)
-        recv = await self.__get_response(_uuid, asyncio.get_event_loop(), timeout=30)
+        recv = await self.__get_response(_uuid, timeout=30)
         return recv
 
     def __get_response(
         self,
         _uuid: str,
-        loop: asyncio.AbstractEventLoop,
         timeout: int = 60
     ):
-        future = loop.create_future()
+        future = asyncio.get_running_loop().create_future()
         self.listeners[_uuid] = future
+        # Drop the listener once the future is settled so timed out requests don't pile up
+        future.add_done_callback(lambda _, u=_uuid: self.listeners.pop(u, None))
         return asyncio.wait_for(future, timeout)
 
     async def request(
@@ -291,18 +408,18 @@ class Client:
 
             logger.info("Requesting IPC Server for %r", route)
         
-            _uuid = str(uuid.uuid4())
-            payload = MessagePayload(
-                type = Payloads.request,
-                id = self.local_name,
-                destination = source,
-                route = route,
-                data = kwargs,
-                uuid = _uuid
-            )
+            _uuid = self._next_uuid()
+            payload = {
+                "type": _P_REQ,
+                "id": self.local_name,
+                "destination": source,
+                "route": route,
+                "data": kwargs,
+                "uuid": _uuid
+            }
 
             await self.send_message(payload)
-            recv = await self.__get_response(_uuid, asyncio.get_event_loop(), timeout=timeout)
+            recv = await self.__get_response(_uuid, timeout=timeout)
             return recv
         
         else:
@@ -320,6 +437,9 @@ class Client:
 
         The data is sent to all connected clients if the destinations list is empty.
 
+        Informs sent during the same event loop iteration are batched into a single
+        message to the server, so they may be sent after requests made in that iteration.
+
         Parameters
         -----------
         data: :class:`Any`
@@ -348,14 +468,14 @@ class Client:
             if not isinstance(destinations, list):
                 destinations = [destinations]
 
-            payload = MessagePayload(
-                type = Payloads.information,
-                id = self.local_name,
-                route = destinations,
-                data = data,
-            )
+            payload = {
+                "type": _P_INFO,
+                "id": self.local_name,
+                "route": destinations,
+                "data": data,
+            }
 
-            await self.send_message(payload)
+            await self.send_message(payload, batchable=True)
         else:
             raise ClientNotReadyError("The client has not been started or has disconnected")
     
@@ -423,96 +543,116 @@ class Client:
 
     async def __on_message(self):
         logger.info("Listening to messages")
+        handlers = self._handlers
+        recv = self.websocket.recv
         while True:
             try:
-                message = WsMessage(orjson.loads(await self.websocket.recv()))
+                data = _loads(await recv())
+                message = WsMessage(data)
             except websockets.exceptions.ConnectionClosedError:
                 self._dispatch_event('winerp_disconnect')
                 if self.reconnect:
                     if not await self.__reconnect_client():
                         break
+                    recv = self.websocket.recv
+                    continue
                 else:
                     break
 
-            if message.type.success and not self._authorized:
-                logger.info("Authorized Successfully")
-                self._dispatch_event('winerp_ready')
-                self._authorized = True
-                self._on_hold = False
-
-            elif message.type.ping:
-                logger.debug("Received a ping from server")
-                asyncio.create_task(self._dispatch(message))
-
-            elif message.type.request:
-                if message.route not in self.__routes:
-                    logger.info("Failed to fulfill request, route not found")
-                    payload = MessagePayload(
-                        type = Payloads.error,
-                        id = self.local_name,
-                        data = "Route not found",
-                        traceback = "Route not found",
-                        destination = message.id,
-                        uuid = message.uuid
-                    )
-                    self.__send_message(payload)
-                    return
-                logger.info("Fulfilling request @ route: %s" % message.route)
-                asyncio.create_task(self._fulfill_request(message))
-                self._dispatch_event('winerp_request', message.route, message.data)
-            
-            elif message.type.response:
-                logger.info("Received a response from server @ uuid: %s" % message.uuid)
-                asyncio.create_task(self._dispatch(message))
-                self._dispatch_event('winerp_response', message.data)
-
-            elif message.type.error:
-                if message.data == "Already authorized.":
-                    self._on_hold = True
-                    logger.warn("Another client is already connected. Requests will be enabled when the other is disconnected.")
-                else:
-                    logger.debug("Failed to fulfill request: %s" % message.data)
-                    self._dispatch_event('winerp_error', message.data)
-
-                if message.uuid is not None:
-                    asyncio.create_task(self._dispatch(message))
-
-            elif message.type.information:
-                if message.data:
-                    logger.debug("Received an information bit from client: %s" % message.id)
-                    self._dispatch_event('winerp_information', message.data, message.id)
-
-            elif message.type.function_call:
-                logger.debug("Received an object function call.")
-                logger.debug(message.data)
-                payload = MessagePayload(
-                    type = Payloads.response,
-                    id = self.local_name,
-                    destination = message.id,
-                    uuid = message.uuid
-                )
-                try:
-                    called_function = self.__sub_routes[message.data["__uuid__"]][message.data["__func__"]]
-                    asyncio.create_task(
-                    self._fulfil_callback(
-                        payload,
-                        called_function,
-                        *message.data["__args__"],
-                        **message.data["__kwargs__"]
-                    )
+            try:
+                handler = handlers[message.type_id]
+            except (IndexError, KeyError, TypeError):
+                logger.debug("Received a message of unknown type: %r" % (data,))
+                continue
+            try:
+                handler(message)
+            except (MissingUUIDError, UUIDNotFoundError) as error:
+                logger.warning("Failed to dispatch a response: %s" % error)
+            except Exception:
+                # A malformed frame from a peer must not stop the receive loop
+                logger.exception("Failed to handle %r" % message)
+
+    def _handle_unexpected(self, message: WsMessage):
+        logger.debug("Ignoring unexpected message: %r" % message)
+
+    def _handle_success(self, message: WsMessage):
+        if not self._authorized:
+            logger.info("Authorized Successfully")
+            self._dispatch_event('winerp_ready')
+            self._authorized = True
+            self._on_hold = False
+
+    def _handle_ping(self, message: WsMessage):
+        logger.debug("Received a ping from server")
+        self._dispatch(message)
+
+    def _handle_request(self, message: WsMessage):
+        if message.route not in self.__routes:
+            logger.info("Failed to fulfill request, route not found")
+            payload = {
+                "type": _P_ERR,
+                "id": self.local_name,
+                "data": "Route not found",
+                "traceback": "Route not found",
+                "destination": message.destination,
+                "uuid": message.uuid
+            }
+            self._send_nowait(payload)
+            return
+        logger.info("Fulfilling request @ route: %s" % message.route)
+        asyncio.create_task(self._fulfill_request(message))
+        self._dispatch_event('winerp_request', message.route, message.data)
+
+    def _handle_response(self, message: WsMessage):
+        logger.info("Received a response from server @ uuid: %s" % message.uuid)
+        self._dispatch_event('winerp_response', message.data)
+        self._dispatch(message)
+
+    def _handle_error(self, message: WsMessage):
+        if message.data == "Already authorized.":
+            self._on_hold = True
+            logger.warn("Another client is already connected. Requests will be enabled when the other is disconnected.")
+        else:
+            logger.debug("Failed to fulfill request: %s" % message.data)
+            self._dispatch_event('winerp_error', message.data)
+
+        if message.uuid is not None:
+            self._dispatch(message)
+
+    def _handle_information(self, message: WsMessage):
+        if message.data:
+            logger.debug("Received an information bit from client: %s" % message.id)
+            self._dispatch_event('winerp_information', message.data, message.id)
+
+    def _handle_function_call(self, message: WsMessage):
+        logger.debug("Received an object function call.")
+        logger.debug(message.data)
+        payload = MessagePayload(
+            type = _P_RESP,
+            id = self.local_name,
+            destination = message.id,
+            uuid = message.uuid
+        )
+        try:
+            called_function = self.__sub_routes[message.data["__uuid__"]][message.data["__func__"]]
+            asyncio.create_task(
+                self._fulfil_callback(
+                    payload,
+                    called_function,
+                    *message.data["__args__"],
+                    **message.data["__kwargs__"]
                 )
-                except KeyError:
-                    payload = MessagePayload(
-                        type = Payloads.error,
-                        id = self.local_name,
-                        data = "The called function has either expired or has never been registered",
-                        traceback = "The called function has either expired or has never been registered",
-                        destination = message.id,
-                        uuid = message.uuid
-                    )
-                    self.__send_message(payload)
-
-                
+            )
+        except KeyError:
+            payload = {
+                "type": _P_ERR,
+                "id": self.local_name,
+                "data": "The called function has either expired or has never been registered",
+                "traceback": "The called function has either expired or has never been registered",
+                "destination": message.id,
+                "uuid": message.uuid
+            }
+            self._send_nowait(payload)
 
     def __parse_object(self, payload):
         payload.pseudo_object = True
@@ -520,26 +660,32 @@ class Client:
         payload.data = dummy_object.serialize()
         self.__register_object_funcs(dummy_object)
 
+    def __format_traceback(self, error: Exception) -> Optional[str]:
+        # Walking the frames is the expensive part of the error path, skip it when it won't be sent
+        if not self.send_traceback:
+            return None
+        buffer = io.StringIO()
+        for chunk in traceback.TracebackException.from_exception(error).format():
+            buffer.write(chunk)
+        return buffer.getvalue()
+
     async def _fulfil_callback(self, payload, function, *args, **kwargs):
         try:
             payload.data = await function(*args, **kwargs)
-            if not isinstance(payload.data, (int, float, str, bool, type(None), list, tuple, dict)):
+            if not isinstance(payload.data, _JSON_TYPES):
                 payload.data = winerpObject(payload.data)
 
             if type(payload.data) == winerpObject:
                 self.__parse_object(payload)
             
-            self.__send_message(payload)
+            await self.send_message(payload)
         except Exception as error:
             logger.exception("Failed to run the registered method")
             self._dispatch_event('winerp_error', error)
-            payload.type = Payloads.error
+            payload.type = _P_ERR
             payload.data = str(error)
-            payload.traceback = ''.join(
-                traceback.format_exception(
-                    TypeError, error, error.__traceback__
-                )
-            )
+            payload.traceback = self.__format_traceback(error)
+            await self.send_message(payload)
         
     
     async def _fulfill_request(self, message: WsMessage):
@@ -547,7 +693,7 @@ class Client:
         func = self.__routes[route]
         data = message.data
         payload = MessagePayload().from_message(message)
-        payload.type = Payloads.response
+        payload.type = _P_RESP
         payload.id = self.local_name
 
 
@@ -558,49 +704,45 @@ class Client:
         except Exception as error:
             logger.exception(error)
             self._dispatch_event('winerp_error', error)
-            etype = type(error)
-            trace = error.__traceback__
-            lines = traceback.format_exception(etype, error, trace)
-            traceback_text = ''.join(lines)
-
-            payload.type = Payloads.error
+            payload.type = _P_ERR
             payload.data = str(error)
-            payload.traceback = traceback_text
+            payload.traceback = self.__format_traceback(error)
         finally:
             try:
                 await self.send_message(payload)
             except TypeError as error:
                 logger.exception("Failed to convert data to json")
                 self._dispatch_event('winerp_error', error)
-                payload.type = Payloads.error
+                payload.type = _P_ERR
                 payload.data = str(error)
-                payload.traceback = ''.join(
-                    traceback.format_exception(
-                        TypeError,
-                        error,
-                        error.__traceback__
-                    )
-                )
-                self.__send_message(payload)
+                payload.traceback = self.__format_traceback(error)
+                await self.send_message(payload)
 
-    async def _dispatch(self, msg: WsMessage):
+    def _dispatch(self, msg: WsMessage):
         data = msg.data
         _uuid = msg.uuid
         if _uuid is None:
             raise MissingUUIDError('UUID is missing.')
-        if _uuid not in self.listeners:
+        future: asyncio.Future = self.listeners.pop(_uuid, None)
+        if future is None:
             raise UUIDNotFoundError(f"UUID {_uuid} not found in listeners.")
-        
-        future: asyncio.Future = self.listeners[_uuid]
-        if not msg.type.error:
-            if msg.pseudo_object:
-                future.set_result(responseObject(self, msg.id, data))
-            else:
-                future.set_result(data)
-        else:
+        if future.done():
+            # Timed out, the done callback just hasn't removed it yet
+            return
+
+        if msg.type_id == _P_ERR:
             future.set_exception(
-                ClientRuntimeError(msg.data)
+                ClientRuntimeError(data)
             )
+        elif msg.pseudo_object:
+            try:
+                response = responseObject(self, msg.id, data)
+            except Exception as error:
+                future.set_exception(error)
+            else:
+                future.set_result(response)
+        else:
+            future.set_result(data)
 
     def event(self, func: Coro, /) -> Coro:
         '''
@@ -634,19 +776,19 @@ class Client:
 
     def _dispatch_event(self, event_name: str, *args, **kwargs):
         logger.debug('Event Dispatch -> %r', event_name)
-        try:
-            for future in self.event_listeners[event_name]:
-                future.set_result(None)
-                logger.debug('Event %r has been dispatched', event_name)
-        except KeyError:
-            ...
-
-        try:
-            coro = getattr(self, f'on_{event_name}')
-        except AttributeError:
-            pass
-        else:
-            self._schedule_event(coro, f'on_{event_name}', *args, **kwargs)
+        # Waiters are one-shot, so take them out instead of resolving them again on the next dispatch
+        waiters = self.event_listeners.pop(event_name, None)
+        if waiters:
+            for future in waiters:
+                if not future.done():
+                    future.set_result(None)
+            logger.debug('Event %r has been dispatched', event_name)
+
+        # Unregistered events are the common case, skip them without raising AttributeError
+        method = 'on_' + event_name
+        coro = getattr(self, method, None)
+        if coro is not None:
+            self._schedule_event(coro, method, *args, **kwargs)
 
     
     def _schedule_event(
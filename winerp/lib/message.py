@@ -4,6 +4,8 @@ class WsMessage:
     r"""
     Represents the message received from the server.
     """
+    __slots__ = ('_message',)
+
     def __init__(self, message: dict):
         self._message = message
     
@@ -19,6 +21,13 @@ class WsMessage:
         :class:`~winerp.lib.payload.PayloadTypes`: Returns the type of the message.
         '''
         return PayloadTypes(self._message["type"])
+
+    @property
+    def type_id(self) -> int:
+        '''
+        :class:`int`: Returns the raw type of the message, one of :class:`~winerp.lib.payload.Payloads`.
+        '''
+        return self._message["type"]
     
     @property
     def id(self) -> int:
@@ -15,6 +15,7 @@ class Payloads:
     ping = 5
     information = 6
     function_call = 7
+    batch = 8
 
 class PayloadTypes:
     '''
@@ -25,7 +26,10 @@ class PayloadTypes:
         | ``response``: Response to a request.
         | ``error``: Error response.
         | ``ping``: Ping message.
+        | ``batch``: Several messages sent as one.
     '''
+    __slots__ = ('_type',)
+
     def __init__(self, type: int) -> None:
         self._type = type
     
@@ -88,6 +92,13 @@ class PayloadTypes:
         '''
         return self._type == Payloads.function_call
 
+    @property
+    def batch(self) -> bool:
+        '''
+        :class:`bool`: Returns ``True`` if the message is a batch of messages.
+        '''
+        return self._type == Payloads.batch
+
 
 
 class MessagePayload:
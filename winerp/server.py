@@ -88,7 +88,16 @@ class Server:
         )
 
     def __on_message(self, client, _, msg):
-        msg = WsMessage(orjson.loads(msg))
+        self.__handle_message(client, orjson.loads(msg))
+
+    def __handle_message(self, client, data):
+        msg = WsMessage(data)
+        if msg.type.batch:
+            logger.debug("Received a batch of %s messages from client %s" % (len(msg.data), client['address'][1]))
+            for each_message in msg.data:
+                self.__handle_message(client, each_message)
+            return
+
         payload = MessagePayload().from_message(msg)
         if msg.type.verification:
             if msg.id in self.active_clients: